@@ -1,7 +1,7 @@
 import os
 from flask import Flask
 from routes.games import games_bp
-from models import db
+from models import db, Game
 from utils.database import get_connection_string
 
 # Get the server directory path
@@ -12,11 +12,15 @@ app: Flask = Flask(__name__)
 # Configure and initialize the database
 app.config['SQLALCHEMY_DATABASE_URI'] = get_connection_string()
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'query_cache_size': 1200}
 db.init_app(app)
 
 # Create tables
 with app.app_context():
     db.create_all()
+    # create_all skips existing tables, so add any game indexes they are missing
+    for index in Game.__table__.indexes:
+        index.create(db.engine, checkfirst=True)
 
 # Register blueprints
 app.register_blueprint(games_bp)
@@ -1,6 +1,23 @@
+import sqlite3
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
-db = SQLAlchemy()
+# Keep instances loaded after commit so handlers can serialize what they just wrote
+db = SQLAlchemy(session_options={"expire_on_commit": False})
+
+@event.listens_for(Engine, "connect")
+def enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    """
+    Turn on foreign key enforcement for SQLite connections.
+    
+    SQLite ignores foreign key constraints unless enabled per connection, and
+    the routes rely on the database to reject unknown publishers and categories.
+    """
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
 
 # Import models after db is defined to avoid circular imports
 from .category import Category
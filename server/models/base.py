@@ -10,6 +10,24 @@ class BaseModel(db.Model):
     """
     __abstract__ = True
     
+    def _attribute_values(self, keys):
+        """
+        Read attribute values for serialization, preferring the instance dictionary.
+        
+        Loaded attributes are read straight from __dict__, skipping the
+        instrumented attribute descriptors. Attributes that are expired,
+        deferred or not yet loaded fall back to regular attribute access so
+        they are loaded as usual.
+        
+        Args:
+            keys (tuple of str): The attribute names to read
+            
+        Returns:
+            list: The attribute values in the same order as keys
+        """
+        state = self.__dict__
+        return [state[key] if key in state else getattr(self, key) for key in keys]
+    
     @staticmethod
     def validate_string_length(field_name, value, min_length=2, allow_none=False):
         """
@@ -36,7 +54,15 @@ class BaseModel(db.Model):
         if not isinstance(value, str):
             raise ValueError(f"{field_name} must be a string")
             
+        # Nothing to measure when any length is acceptable
+        if min_length <= 0:
+            return value
+
+        # Only strip (and copy) the string when surrounding whitespace could affect the result
+        if len(value) >= min_length and not value[0].isspace() and not value[-1].isspace():
+            return value
+
         if len(value.strip()) < min_length:
             raise ValueError(f"{field_name} must be at least {min_length} characters")
-            
+
         return value
\ No newline at end of file
@@ -1,6 +1,8 @@
 from . import db
 from .base import BaseModel
-from sqlalchemy.orm import validates, relationship
+from .game import Game
+from sqlalchemy import select, func
+from sqlalchemy.orm import validates, relationship, column_property, deferred
 
 class Category(BaseModel):
     """
@@ -13,11 +15,21 @@ class Category(BaseModel):
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False, unique=True)
-    description = db.Column(db.Text)
+    # Deferred: game queries join this table but only emit its id and name
+    description = deferred(db.Column(db.Text))
     
     # One-to-many relationship: one category has many games
     games = relationship("Game", back_populates="category")
     
+    # Number of associated games, counted in SQL rather than by loading the collection
+    game_count = column_property(
+        select(func.count(Game.id)).where(Game.category_id == id).correlate_except(Game).scalar_subquery(),
+        deferred=True
+    )
+    
+    # Attributes read by to_dict, in unpacking order
+    _DICT_KEYS = ('id', 'name', 'description', 'game_count')
+    
     @validates('name')
     def validate_name(self, key, name):
         """
@@ -69,9 +81,10 @@ class Category(BaseModel):
             dict: A dictionary containing the category's data including
                   the count of associated games
         """
+        category_id, name, description, game_count = self._attribute_values(self._DICT_KEYS)
         return {
-            'id': self.id,
-            'name': self.name,
-            'description': self.description,
-            'game_count': len(self.games) if self.games else 0
+            'id': category_id,
+            'name': name,
+            'description': description,
+            'game_count': game_count or 0
         }
\ No newline at end of file
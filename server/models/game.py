@@ -2,6 +2,18 @@ from . import db
 from .base import BaseModel
 from sqlalchemy.orm import validates, relationship
 
+def _reference_dict(record):
+    """
+    Convert a related publisher or category into its id/name summary.
+    
+    Args:
+        record (Publisher or Category or None): The related record
+        
+    Returns:
+        dict or None: The record's id and name, or None if there is no record
+    """
+    return {'id': record.id, 'name': record.name} if record is not None else None
+
 class Game(BaseModel):
     """
     Game model representing a game in the crowdfunding platform.
@@ -16,14 +28,17 @@ class Game(BaseModel):
     description = db.Column(db.Text, nullable=False)
     star_rating = db.Column(db.Float, nullable=True)
     
-    # Foreign keys for one-to-many relationships
-    category_id = db.Column(db.Integer, db.ForeignKey('categories.id'), nullable=False)
-    publisher_id = db.Column(db.Integer, db.ForeignKey('publishers.id'), nullable=False)
+    # Foreign keys for one-to-many relationships, indexed for joins and per-parent counts
+    category_id = db.Column(db.Integer, db.ForeignKey('categories.id'), nullable=False, index=True)
+    publisher_id = db.Column(db.Integer, db.ForeignKey('publishers.id'), nullable=False, index=True)
     
     # One-to-many relationships (many games belong to one category/publisher)
     category = relationship("Category", back_populates="games")
     publisher = relationship("Publisher", back_populates="games")
     
+    # Attributes read by to_dict, in unpacking order
+    _DICT_KEYS = ('id', 'title', 'description', 'star_rating', 'publisher', 'category')
+    
     @validates('title')
     def validate_name(self, key, name):
         """
@@ -56,9 +71,7 @@ class Game(BaseModel):
         Raises:
             ValueError: If the description doesn't meet validation requirements
         """
-        if description is not None:
-            return self.validate_string_length('Description', description, min_length=10, allow_none=True)
-        return description
+        return self.validate_string_length('Description', description, min_length=10, allow_none=True)
     
     def __repr__(self):
         """
@@ -77,11 +90,12 @@ class Game(BaseModel):
             dict: A dictionary containing the game's data with publisher
                   and category information included
         """
+        game_id, title, description, star_rating, publisher, category = self._attribute_values(self._DICT_KEYS)
         return {
-            'id': self.id,
-            'title': self.title,
-            'description': self.description,
-            'publisher': {'id': self.publisher.id, 'name': self.publisher.name} if self.publisher else None,
-            'category': {'id': self.category.id, 'name': self.category.name} if self.category else None,
-            'starRating': self.star_rating  # Changed from star_rating to starRating
+            'id': game_id,
+            'title': title,
+            'description': description,
+            'publisher': _reference_dict(publisher),
+            'category': _reference_dict(category),
+            'starRating': star_rating  # Changed from star_rating to starRating
         }
\ No newline at end of file
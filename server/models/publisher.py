@@ -1,6 +1,8 @@
 from . import db
 from .base import BaseModel
-from sqlalchemy.orm import validates, relationship
+from .game import Game
+from sqlalchemy import select, func
+from sqlalchemy.orm import validates, relationship, column_property, deferred
 
 class Publisher(BaseModel):
     """
@@ -13,10 +15,20 @@ class Publisher(BaseModel):
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False, unique=True)
-    description = db.Column(db.Text)
+    # Deferred: joined game queries only need the publisher's id and name
+    description = deferred(db.Column(db.Text))
     
     # One-to-many relationship: one publisher has many games
     games = relationship("Game", back_populates="publisher")
+    
+    # Count of games published by this publisher, computed in SQL on access
+    game_count = column_property(
+        select(func.count(Game.id)).where(Game.publisher_id == id).correlate_except(Game).scalar_subquery(),
+        deferred=True
+    )
+    
+    # Attributes read by to_dict, in unpacking order
+    _DICT_KEYS = ('id', 'name', 'description', 'game_count')
 
     @validates('name')
     def validate_name(self, key, name):
@@ -69,9 +81,10 @@ class Publisher(BaseModel):
             dict: A dictionary containing the publisher's data including
                   the count of associated games
         """
+        publisher_id, name, description, game_count = self._attribute_values(self._DICT_KEYS)
         return {
-            'id': self.id,
-            'name': self.name,
-            'description': self.description,
-            'game_count': len(self.games) if self.games else 0
+            'id': publisher_id,
+            'name': name,
+            'description': description,
+            'game_count': game_count or 0
         }
\ No newline at end of file
@@ -1,31 +1,154 @@
-from flask import jsonify, Response, Blueprint, request
+import orjson
+from threading import Lock
+from cachetools import TTLCache
+from flask import Response, Blueprint, request
+from werkzeug.http import generate_etag
 from models import db, Game, Publisher, Category
-from sqlalchemy.orm import Query
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select, exists, Select
+from sqlalchemy.orm import contains_eager
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 # Create a Blueprint for games routes
 games_bp = Blueprint('games', __name__)
 
-def get_games_base_query() -> Query:
+# Statements are built once at import time so every request reuses the same
+# construct, letting SQLAlchemy's compiled statement cache skip recompilation.
+
+# Games with publisher and category populated from outer joins, so games are
+# returned even without related data and serializing them never lazy-loads.
+_GAMES_STMT: Select = select(Game).outerjoin(
+    Game.publisher
+).outerjoin(
+    Game.category
+).options(
+    contains_eager(Game.publisher),
+    contains_eager(Game.category)
+)
+
+# Only the game columns the list endpoint emits, so rows can be turned into
+# dictionaries without building ORM instances. Publishers and categories are
+# fetched separately, once per distinct id, rather than repeated on every row.
+_GAMES_LIST_STMT: Select = select(
+    Game.id,
+    Game.title,
+    Game.description,
+    Game.star_rating,
+    Game.publisher_id,
+    Game.category_id
+).order_by(Game.id)
+
+# Serialized single-game responses keyed by game id, as (body, etag) pairs.
+# Entries expire after a short TTL and are dropped when a game is updated or
+# deleted; the lock guards the cache, which is not thread-safe on its own.
+game_cache: TTLCache = TTLCache(maxsize=1024, ttl=30)
+_game_cache_lock: Lock = Lock()
+
+# Payload fields required to create a game, in the order they are reported
+_REQUIRED_FIELDS: tuple[str, ...] = ('title', 'description', 'category_id', 'publisher_id')
+_REQUIRED_FIELD_SET: frozenset[str] = frozenset(_REQUIRED_FIELDS)
+
+# Scalar payload fields copied onto a game as-is when updating
+_UPDATABLE_FIELDS: tuple[str, ...] = ('title', 'description', 'star_rating')
+
+def _json_response(obj: object, status: int = 200) -> Response:
     """
-    Create a base query for retrieving games with joined publisher and category data.
+    Serialize an object to a JSON response using orjson.
     
-    This function creates a SQLAlchemy query that joins the Game table with
-    Publisher and Category tables using outer joins to ensure games are
-    returned even if they don't have associated publishers or categories.
+    Args:
+        obj (object): The JSON-serializable data for the response body
+        status (int, optional): The HTTP status code. Defaults to 200.
+        
+    Returns:
+        Response: A Flask Response object with an application/json body
+    """
+    return Response(orjson.dumps(obj), status=status, mimetype='application/json')
+
+def get_game_by_id(id: int) -> Game | None:
+    """
+    Retrieve a single game with its publisher and category data loaded.
     
+    Args:
+        id (int): The unique identifier of the game to retrieve
+        
     Returns:
-        Query: A SQLAlchemy Query object for games with joined related data
-    """
-    return db.session.query(Game).join(
-        Publisher, 
-        Game.publisher_id == Publisher.id, 
-        isouter=True
-    ).join(
-        Category, 
-        Game.category_id == Category.id, 
-        isouter=True
-    )
+        Game | None: The matching game, or None if it does not exist
+    """
+    return db.session.scalars(_GAMES_STMT.where(Game.id == id)).first()
+
+def invalidate_cached_game(id: int) -> None:
+    """
+    Remove a game's cached response so the next read reflects the database.
+    
+    Args:
+        id (int): The unique identifier of the game that changed
+    """
+    with _game_cache_lock:
+        game_cache.pop(id, None)
+
+def get_references_by_id(model: type[Publisher] | type[Category], ids: set[int]) -> dict[int, dict]:
+    """
+    Batch-load the id and name of publishers or categories with a single IN query.
+    
+    Args:
+        model (type): The Publisher or Category model to load from
+        ids (set[int]): The ids referenced by the games being listed
+        
+    Returns:
+        dict[int, dict]: A mapping of id to the {'id', 'name'} dictionary
+                         used in game responses
+    """
+    if not ids:
+        return {}
+    rows = db.session.execute(select(model.id, model.name).where(model.id.in_(ids)))
+    return {row.id: {'id': row.id, 'name': row.name} for row in rows}
+
+def find_missing_reference(data: dict) -> str | None:
+    """
+    Identify a publisher or category referenced by a payload that does not exist.
+    
+    Foreign keys are enforced by the database, so this is only called after a
+    write fails with an IntegrityError; successful writes skip the lookups.
+    
+    Args:
+        data (dict): The request payload that failed to be written
+        
+    Returns:
+        str | None: An error message naming the missing record, or None if
+                    both referenced records exist
+    """
+    # EXISTS checks return a boolean without loading and hydrating the rows
+    if 'publisher_id' in data and not db.session.scalar(select(exists().where(Publisher.id == data['publisher_id']))):
+        return "Publisher not found"
+    if 'category_id' in data and not db.session.scalar(select(exists().where(Category.id == data['category_id']))):
+        return "Category not found"
+    return None
+
+@games_bp.teardown_request
+def rollback_session(exc: BaseException | None) -> None:
+    """
+    Roll back any uncommitted work left by a games request.
+    
+    Handlers return error responses without rolling back themselves, so the
+    session is cleaned up here once per request. This is a no-op when the
+    request committed or never touched the database.
+    
+    Args:
+        exc (BaseException | None): The unhandled exception, if any
+    """
+    db.session.rollback()
+
+@games_bp.errorhandler(SQLAlchemyError)
+def handle_database_error(error: SQLAlchemyError) -> Response:
+    """
+    Convert unexpected database errors into a JSON 500 response.
+    
+    Args:
+        error (SQLAlchemyError): The database error raised by a handler
+        
+    Returns:
+        Response: A Flask Response object with a generic error message
+    """
+    return _json_response({"error": "Internal server error"}, 500)
 
 @games_bp.route('/api/games', methods=['GET'])
 def get_games() -> Response:
@@ -38,21 +161,36 @@ def get_games() -> Response:
     Returns:
         Response: A Flask Response object containing JSON array of games
     """
-    # Use the base query for all games
-    games_query = get_games_base_query().all()
+    # Fetch plain game rows rather than hydrating ORM objects
+    rows = db.session.execute(_GAMES_LIST_STMT).mappings().all()
     
-    # Convert the results using the model's to_dict method
-    games_list = [game.to_dict() for game in games_query]
+    # Resolve related records with one batched query per table
+    publishers = get_references_by_id(Publisher, {row['publisher_id'] for row in rows})
+    categories = get_references_by_id(Category, {row['category_id'] for row in rows})
     
-    return jsonify(games_list)
+    # Build the same shape as Game.to_dict directly from each row
+    games_list = [
+        {
+            'id': row['id'],
+            'title': row['title'],
+            'description': row['description'],
+            'publisher': publishers.get(row['publisher_id']),
+            'category': categories.get(row['category_id']),
+            'starRating': row['star_rating']
+        }
+        for row in rows
+    ]
+    
+    return _json_response(games_list)
 
 @games_bp.route('/api/games/<int:id>', methods=['GET'])
-def get_game(id: int) -> tuple[Response, int] | Response:
+def get_game(id: int) -> Response:
     """
     Retrieve a specific game by its ID.
     
     This endpoint returns a single game with the specified ID, including
-    its associated publisher and category information.
+    its associated publisher and category information. Responses are served
+    from a short-lived in-process cache and carry an ETag for conditional requests.
     
     Args:
         id (int): The unique identifier of the game to retrieve
@@ -61,20 +199,31 @@ def get_game(id: int) -> tuple[Response, int] | Response:
         Response: A Flask Response object containing JSON data for the game,
                  or a 404 error response if the game is not found
     """
-    # Use the base query and add filter for specific game
-    game_query = get_games_base_query().filter(Game.id == id).first()
+    with _game_cache_lock:
+        cached = game_cache.get(id)
     
-    # Return 404 if game not found
-    if not game_query: 
-        return jsonify({"error": "Game not found"}), 404
+    if cached is None:
+        game_query = get_game_by_id(id)
+        
+        # Return 404 if game not found
+        if not game_query: 
+            return _json_response({"error": "Game not found"}, 404)
+        
+        # Serialize once and keep the body for subsequent reads
+        body = orjson.dumps(game_query.to_dict())
+        cached = (body, generate_etag(body))
+        with _game_cache_lock:
+            game_cache[id] = cached
     
-    # Convert the result using the model's to_dict method
-    game = game_query.to_dict()
+    body, etag = cached
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
     
-    return jsonify(game)
+    # Answer conditional requests with 304 Not Modified when the ETag matches
+    return response.make_conditional(request)
 
 @games_bp.route('/api/games', methods=['POST'])
-def create_game() -> tuple[Response, int] | Response:
+def create_game() -> Response:
     """
     Create a new game.
     
@@ -85,28 +234,19 @@ def create_game() -> tuple[Response, int] | Response:
         Response: A Flask Response object containing JSON data for the created game,
                  or error responses for validation failures or missing data
     """
+    # Parse JSON data from request
+    data = request.get_json(force=True, silent=True)
+    if data is None or not data:
+        return _json_response({"error": "No JSON data provided"}, 400)
+    
+    # Validate required fields
+    missing_fields = _REQUIRED_FIELD_SET.difference(data)
+    if missing_fields:
+        missing_list = ', '.join(field for field in _REQUIRED_FIELDS if field in missing_fields)
+        return _json_response({"error": f"Missing required fields: {missing_list}"}, 400)
+    
     try:
-        # Parse JSON data from request
-        data = request.get_json(force=True, silent=True)
-        if data is None or not data:
-            return jsonify({"error": "No JSON data provided"}), 400
-        
-        # Validate required fields
-        required_fields = ['title', 'description', 'category_id', 'publisher_id']
-        missing_fields = [field for field in required_fields if field not in data]
-        if missing_fields:
-            return jsonify({"error": f"Missing required fields: {', '.join(missing_fields)}"}), 400
-        
-        # Validate that publisher and category exist
-        publisher = Publisher.query.get(data['publisher_id'])
-        if not publisher:
-            return jsonify({"error": "Publisher not found"}), 404
-            
-        category = Category.query.get(data['category_id'])
-        if not category:
-            return jsonify({"error": "Category not found"}), 404
-        
-        # Create new game
+        # Create new game; the database rejects unknown publishers and categories
         new_game = Game(
             title=data['title'],
             description=data['description'],
@@ -117,23 +257,21 @@ def create_game() -> tuple[Response, int] | Response:
         
         db.session.add(new_game)
         db.session.commit()
-        
-        # Return the created game with related data
-        created_game = get_games_base_query().filter(Game.id == new_game.id).first()
-        return jsonify(created_game.to_dict()), 201
-        
     except ValueError as e:
+        return _json_response({"error": str(e)}, 400)
+    except IntegrityError:
         db.session.rollback()
-        return jsonify({"error": str(e)}), 400
-    except IntegrityError as e:
-        db.session.rollback()
-        return jsonify({"error": "Database integrity error"}), 409
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({"error": "Internal server error"}), 500
+        missing_reference = find_missing_reference(data)
+        if missing_reference:
+            return _json_response({"error": missing_reference}, 404)
+        return _json_response({"error": "Database integrity error"}, 409)
+    
+    # Return the created game with related data
+    created_game = get_game_by_id(new_game.id)
+    return _json_response(created_game.to_dict(), 201)
 
 @games_bp.route('/api/games/<int:id>', methods=['PUT'])
-def update_game(id: int) -> tuple[Response, int] | Response:
+def update_game(id: int) -> Response:
     """
     Update an existing game by ID.
     
@@ -147,57 +285,53 @@ def update_game(id: int) -> tuple[Response, int] | Response:
         Response: A Flask Response object containing JSON data for the updated game,
                  or error responses for validation failures or if game not found
     """
+    # Get the existing game with its publisher and category loaded
+    game = get_game_by_id(id)
+    if not game:
+        return _json_response({"error": "Game not found"}, 404)
+    
+    # Parse JSON data from request  
+    data = request.get_json(force=True, silent=True)
+    if data is None or not data:
+        return _json_response({"error": "No JSON data provided"}, 400)
+    
     try:
-        # Get the existing game
-        game = Game.query.get(id)
-        if not game:
-            return jsonify({"error": "Game not found"}), 404
-        
-        # Parse JSON data from request  
-        data = request.get_json(force=True, silent=True)
-        if data is None or not data:
-            return jsonify({"error": "No JSON data provided"}), 400
-        
         # Update fields if provided
-        if 'title' in data:
-            game.title = data['title']
-        if 'description' in data:
-            game.description = data['description']
-        if 'star_rating' in data:
-            game.star_rating = data['star_rating']
+        for field in _UPDATABLE_FIELDS:
+            if field in data:
+                setattr(game, field, data[field])
             
-        # Validate and update publisher_id if provided
-        if 'publisher_id' in data:
-            publisher = Publisher.query.get(data['publisher_id'])
+        # Only look up references that change; the loaded record is also
+        # what the response needs, so nothing has to be re-read after commit
+        if 'publisher_id' in data and data['publisher_id'] != game.publisher_id:
+            publisher = db.session.get(Publisher, data['publisher_id'])
             if not publisher:
-                return jsonify({"error": "Publisher not found"}), 404
-            game.publisher_id = data['publisher_id']
+                return _json_response({"error": "Publisher not found"}, 404)
+            game.publisher = publisher
             
-        # Validate and update category_id if provided
-        if 'category_id' in data:
-            category = Category.query.get(data['category_id'])
+        if 'category_id' in data and data['category_id'] != game.category_id:
+            category = db.session.get(Category, data['category_id'])
             if not category:
-                return jsonify({"error": "Category not found"}), 404
-            game.category_id = data['category_id']
+                return _json_response({"error": "Category not found"}, 404)
+            game.category = category
         
         db.session.commit()
-        
-        # Return the updated game with related data
-        updated_game = get_games_base_query().filter(Game.id == id).first()
-        return jsonify(updated_game.to_dict())
-        
     except ValueError as e:
+        return _json_response({"error": str(e)}, 400)
+    except IntegrityError:
         db.session.rollback()
-        return jsonify({"error": str(e)}), 400
-    except IntegrityError as e:
-        db.session.rollback()
-        return jsonify({"error": "Database integrity error"}), 409
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({"error": "Internal server error"}), 500
+        missing_reference = find_missing_reference(data)
+        if missing_reference:
+            return _json_response({"error": missing_reference}, 404)
+        return _json_response({"error": "Database integrity error"}, 409)
+    
+    invalidate_cached_game(id)
+    
+    # Objects are not expired on commit, so the game serializes in-process
+    return _json_response(game.to_dict())
 
 @games_bp.route('/api/games/<int:id>', methods=['DELETE'])
-def delete_game(id: int) -> tuple[Response, int]:
+def delete_game(id: int) -> Response:
     """
     Delete a game by ID.
     
@@ -207,17 +341,13 @@ def delete_game(id: int) -> tuple[Response, int]:
     Returns:
         Response: A Flask Response object with success message or error if game not found
     """
-    try:
-        # Get the existing game
-        game = Game.query.get(id)
-        if not game:
-            return jsonify({"error": "Game not found"}), 404
-        
-        db.session.delete(game)
-        db.session.commit()
-        
-        return jsonify({"message": "Game deleted successfully"}), 200
-        
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({"error": "Internal server error"}), 500
+    # Get the existing game
+    game = db.session.get(Game, id)
+    if not game:
+        return _json_response({"error": "Game not found"}, 404)
+    
+    db.session.delete(game)
+    db.session.commit()
+    invalidate_cached_game(id)
+    
+    return _json_response({"message": "Game deleted successfully"}, 200)
@@ -0,0 +1,63 @@
+from functools import lru_cache
+from typing import Any, FrozenSet, Tuple
+from flask import Flask
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from models import db
+from routes.games import games_bp
+
+def _configure_sqlite_connection(dbapi_connection: Any, connection_record: Any) -> None:
+    """Tune the throwaway test database and stop pysqlite issuing its own BEGIN"""
+    dbapi_connection.isolation_level = None
+
+    # Test data never needs to survive a crash, so skip durability work
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=MEMORY')
+    cursor.execute('PRAGMA synchronous=OFF')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.close()
+
+def _emit_begin(connection: Any) -> None:
+    """Start transactions explicitly so SAVEPOINTs nest inside them"""
+    connection.exec_driver_sql('BEGIN')
+
+@lru_cache(maxsize=None)
+def make_test_app(config: FrozenSet[Tuple[str, Any]] = frozenset()) -> Flask:
+    """
+    Build a Flask app backed by a shared in-memory SQLite database for testing.
+
+    Apps are cached by configuration, so every test class asking for the same
+    settings reuses one app, engine and schema instead of rebuilding them.
+    Callers own the data they put in the database and must remove it when done.
+
+    Args:
+        config (FrozenSet[Tuple[str, Any]], optional): Extra Flask config
+            items applied on top of the test defaults. Defaults to no extras.
+
+    Returns:
+        Flask: The configured app with all blueprints registered and tables created
+    """
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+
+    # Share a single in-memory connection so the schema outlives each test
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'poolclass': StaticPool,
+        'connect_args': {'check_same_thread': False}
+    }
+    app.config.update(config)
+
+    # Register blueprints
+    app.register_blueprint(games_bp)
+
+    # Initialize in-memory database for testing and build the schema once
+    db.init_app(app)
+    with app.app_context():
+        # pysqlite's implicit transaction handling breaks SAVEPOINTs, so
+        # let SQLAlchemy emit BEGIN itself (see the SQLAlchemy SQLite docs)
+        event.listen(db.engine, 'connect', _configure_sqlite_connection)
+        event.listen(db.engine, 'begin', _emit_begin)
+        db.create_all()
+
+    return app
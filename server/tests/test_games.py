@@ -1,9 +1,12 @@
 import unittest
-import json
-from typing import Dict, List, Any, Optional
-from flask import Flask, Response
+import orjson
+from typing import Dict, List, Any, Optional, FrozenSet, Tuple
+from sqlalchemy import insert
+from sqlalchemy.orm import scoped_session, sessionmaker
+from werkzeug.test import EnvironBuilder
 from models import Game, Publisher, Category, db
-from routes.games import games_bp
+from routes.games import game_cache
+from tests._app_factory import make_test_app
 
 class TestGamesRoutes(unittest.TestCase):
     """
@@ -41,121 +44,232 @@ class TestGamesRoutes(unittest.TestCase):
         ]
     }
     
+    # Request payloads shared by the mutation tests, serialized once up front
+    PAYLOADS: Dict[str, Dict[str, Any]] = {
+        "refreshed_title": {
+            "title": "Refreshed Test Game"
+        },
+        "new_game": {
+            "title": "New Test Game",
+            "description": "This is a test game for creation testing",
+            "publisher_id": 1,
+            "category_id": 1,
+            "star_rating": 4.8
+        },
+        "incomplete_game": {
+            "title": "Incomplete Game"
+            # Missing description, publisher_id, category_id
+        },
+        "invalid_publisher_game": {
+            "title": "Test Game",
+            "description": "This is a test game with invalid publisher",
+            "publisher_id": 999,  # Non-existent publisher
+            "category_id": 1
+        },
+        "invalid_category_game": {
+            "title": "Test Game",
+            "description": "This is a test game with invalid category",
+            "publisher_id": 1,
+            "category_id": 999  # Non-existent category
+        },
+        "updated_title_and_rating": {
+            "title": "Updated Test Game",
+            "star_rating": 5.0
+        },
+        "updated_references": {
+            "publisher_id": 2,
+            "category_id": 2
+        },
+        "updated_title": {
+            "title": "Updated Game"
+        },
+        "invalid_publisher_update": {
+            "publisher_id": 999  # Non-existent publisher
+        },
+        "invalid_category_update": {
+            "category_id": 999  # Non-existent category
+        }
+    }
+    PAYLOAD_BYTES: Dict[str, bytes] = {name: orjson.dumps(payload) for name, payload in PAYLOADS.items()}
+    
+    # Flask settings for the shared test app; also its cache key
+    APP_CONFIG: FrozenSet[Tuple[str, Any]] = frozenset({
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        'SQLALCHEMY_RECORD_QUERIES': False
+    }.items())
+    
     # API paths
     GAMES_API_PATH: str = '/api/games'
+    GAME_ITEM_PATH: str = GAMES_API_PATH + '/%d'
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Create the Flask app and test client once for all tests"""
+        # Expected (title, publisher name, category name, star rating) for
+        # each seeded game, in seeding order
+        cls.EXPECTED_GAMES = tuple(
+            (
+                game["title"],
+                cls.TEST_DATA["publishers"][game["publisher_index"]]["name"],
+                cls.TEST_DATA["categories"][game["category_index"]]["name"],
+                game["star_rating"]
+            )
+            for game in cls.TEST_DATA["games"]
+        )
+        
+        # Reuse the shared test app for this configuration
+        cls.app = make_test_app(cls.APP_CONFIG)
+        
+        # Initialize the test client and keep it open for the whole class
+        cls.client = cls.app.test_client()
+        cls.client.__enter__()
+        
+        # Build the games list request once for tests that call the WSGI app directly
+        cls.games_list_builder = EnvironBuilder(path=cls.GAMES_API_PATH, method='GET')
+        
+        with cls.app.app_context():
+            # Seed data once; each test's changes are rolled back in tearDown
+            cls._seed_test_data()
+            db.session.remove()
+            
+            # Keep the engine so tests can open connections without an app context
+            cls.engine = db.engine
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Remove the seeded data, leaving the shared schema for other test classes"""
+        cls.client.__exit__(None, None, None)
+        
+        with cls.engine.begin() as connection:
+            for table in reversed(db.metadata.sorted_tables):
+                connection.execute(table.delete())
 
     def setUp(self) -> None:
-        """Set up test database and seed data"""
-        # Create a fresh Flask app for testing
-        self.app = Flask(__name__)
-        self.app.config['TESTING'] = True
-        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
-        self.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-        
-        # Register the games blueprint
-        self.app.register_blueprint(games_bp)
-        
-        # Initialize the test client
-        self.client = self.app.test_client()
-        
-        # Initialize in-memory database for testing
-        db.init_app(self.app)
-        
-        # Create tables and seed data
-        with self.app.app_context():
-            db.create_all()
-            self._seed_test_data()
+        """Set up a per-test transaction over the seeded data"""
+        # Start every test without cached game responses
+        game_cache.clear()
+        
+        # Run the test inside an outer transaction; session commits from the
+        # handlers only release SAVEPOINTs, so tearDown can undo everything.
+        # No app context is pushed here: the open test client keeps each
+        # request's contexts until the next request, and they must not nest.
+        self.connection = self.engine.connect()
+        self.transaction = self.connection.begin()
+        self.app_session = db.session
+        db.session = scoped_session(sessionmaker(
+            bind=self.connection,
+            join_transaction_mode='create_savepoint',
+            expire_on_commit=False
+        ))
 
     def tearDown(self) -> None:
-        """Clean up test database and ensure proper connection closure"""
-        with self.app.app_context():
-            db.session.remove()
-            db.drop_all()
-            db.engine.dispose()
+        """Roll back the test's transaction and restore the app session"""
+        db.session.remove()
+        self.transaction.rollback()
+        self.connection.close()
+        db.session = self.app_session
 
-    def _seed_test_data(self) -> None:
+    def _call_wsgi_app(self, builder: EnvironBuilder) -> Tuple[str, List[Tuple[str, str]], bytes]:
+        """
+        Run a request straight through the app's WSGI callable.
+        
+        Skips the test client's cookie handling and context preservation for
+        tests that only care about what the handler returns.
+        
+        Args:
+            builder (EnvironBuilder): The prebuilt request to send
+            
+        Returns:
+            Tuple[str, List[Tuple[str, str]], bytes]: The status line, headers and body
+        """
+        collected: List[Any] = []
+        
+        def collect_response(status: str, headers: List[Tuple[str, str]], exc_info: Any = None) -> Any:
+            collected.extend((status, headers))
+            return None
+        
+        app_iter = self.app.wsgi_app(builder.get_environ(), collect_response)
+        try:
+            body = b''.join(app_iter)
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+        
+        status, headers = collected
+        return status, headers, body
+
+    @classmethod
+    def _seed_test_data(cls) -> None:
         """Helper method to seed test data"""
-        # Create test publishers
+        # Assign IDs up front so games can reference them directly
         publishers = [
-            Publisher(**publisher_data) for publisher_data in self.TEST_DATA["publishers"]
+            {"id": index + 1, **publisher_data}
+            for index, publisher_data in enumerate(cls.TEST_DATA["publishers"])
         ]
-        db.session.add_all(publishers)
-        
-        # Create test categories
         categories = [
-            Category(**category_data) for category_data in self.TEST_DATA["categories"]
+            {"id": index + 1, **category_data}
+            for index, category_data in enumerate(cls.TEST_DATA["categories"])
         ]
-        db.session.add_all(categories)
-        
-        # Commit to get IDs
-        db.session.commit()
         
         # Create test games
         games = []
-        for game_data in self.TEST_DATA["games"]:
+        for index, game_data in enumerate(cls.TEST_DATA["games"]):
             game_dict = game_data.copy()
             publisher_index = game_dict.pop("publisher_index")
             category_index = game_dict.pop("category_index")
             
-            games.append(Game(
+            games.append({
+                "id": index + 1,
                 **game_dict,
-                publisher=publishers[publisher_index],
-                category=categories[category_index]
-            ))
-            
-        db.session.add_all(games)
+                "publisher_id": publishers[publisher_index]["id"],
+                "category_id": categories[category_index]["id"]
+            })
+        
+        # One multi-row INSERT per table, skipping the ORM unit of work
+        db.session.execute(insert(Publisher), publishers)
+        db.session.execute(insert(Category), categories)
+        db.session.execute(insert(Game), games)
         db.session.commit()
-
-    def _get_response_data(self, response: Response) -> Any:
-        """Helper method to parse response data"""
-        return json.loads(response.data)
+        
+        # Expose the seeded IDs so tests don't need a request to discover them
+        cls.seeded_game_ids = [game["id"] for game in games]
 
     def test_get_games_success(self) -> None:
         """Test successful retrieval of multiple games"""
         # Act
-        response = self.client.get(self.GAMES_API_PATH)
-        data = self._get_response_data(response)
+        status, _, body = self._call_wsgi_app(self.games_list_builder)
+        data = orjson.loads(body)
         
         # Assert
-        self.assertEqual(response.status_code, 200)
+        self.assertEqual(status, '200 OK')
         self.assertEqual(len(data), len(self.TEST_DATA["games"]))
         
-        # Verify all games using loop instead of manual testing
-        for i, game_data in enumerate(data):
-            test_game = self.TEST_DATA["games"][i]
-            test_publisher = self.TEST_DATA["publishers"][test_game["publisher_index"]]
-            test_category = self.TEST_DATA["categories"][test_game["category_index"]]
-            
-            self.assertEqual(game_data['title'], test_game["title"])
-            self.assertEqual(game_data['publisher']['name'], test_publisher["name"])
-            self.assertEqual(game_data['category']['name'], test_category["name"])
-            self.assertEqual(game_data['starRating'], test_game["star_rating"])
-
-    def test_get_games_structure(self) -> None:
-        """Test the response structure for games"""
-        # Act
-        response = self.client.get(self.GAMES_API_PATH)
-        data = self._get_response_data(response)
-        
-        # Assert
-        self.assertEqual(response.status_code, 200)
-        self.assertIsInstance(data, list)
-        self.assertEqual(len(data), len(self.TEST_DATA["games"]))
-        
-        required_fields = ['id', 'title', 'description', 'publisher', 'category', 'starRating']
-        for field in required_fields:
-            self.assertIn(field, data[0])
+        # Verify the response structure using the same request
+        with self.subTest("structure"):
+            self.assertIsInstance(data, list)
+            required_fields = {'id', 'title', 'description', 'publisher', 'category', 'starRating'}
+            self.assertTrue(required_fields.issubset(data[0]))
+        
+        # Verify all games with a single comparison against the expected data
+        actual = tuple(
+            (
+                game_data['title'],
+                game_data['publisher']['name'],
+                game_data['category']['name'],
+                game_data['starRating']
+            )
+            for game_data in data
+        )
+        self.assertEqual(actual, self.EXPECTED_GAMES)
 
     def test_get_game_by_id_success(self) -> None:
         """Test successful retrieval of a single game by ID"""
-        # Get the first game's ID from the list endpoint
-        response = self.client.get(self.GAMES_API_PATH)
-        games = self._get_response_data(response)
-        game_id = games[0]['id']
+        # Use the first seeded game's ID
+        game_id = self.seeded_game_ids[0]
         
         # Act
-        response = self.client.get(f'{self.GAMES_API_PATH}/{game_id}')
-        data = self._get_response_data(response)
+        response = self.client.get(self.GAME_ITEM_PATH % game_id)
+        data = response.get_json()
         
         # Assert
         first_game = self.TEST_DATA["games"][0]
@@ -165,11 +279,45 @@ class TestGamesRoutes(unittest.TestCase):
         self.assertEqual(data['title'], first_game["title"])
         self.assertEqual(data['publisher']['name'], first_publisher["name"])
         
+    def test_get_game_by_id_not_modified(self) -> None:
+        """Test that a matching ETag returns 304 for a single game"""
+        # Arrange
+        game_id = self.seeded_game_ids[0]
+        response = self.client.get(self.GAME_ITEM_PATH % game_id)
+        etag = response.headers['ETag']
+        
+        # Act
+        response = self.client.get(self.GAME_ITEM_PATH % game_id, headers={'If-None-Match': etag})
+        
+        # Assert
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+
+    def test_get_game_by_id_after_update(self) -> None:
+        """Test that a cached game is refreshed after it is updated"""
+        # Arrange - read the game so its response is cached
+        game_id = self.seeded_game_ids[0]
+        self.client.get(self.GAME_ITEM_PATH % game_id)
+        update_data = self.PAYLOADS["refreshed_title"]
+        
+        # Act
+        self.client.put(
+            self.GAME_ITEM_PATH % game_id,
+            data=self.PAYLOAD_BYTES["refreshed_title"],
+            content_type='application/json'
+        )
+        response = self.client.get(self.GAME_ITEM_PATH % game_id)
+        data = response.get_json()
+        
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data['title'], update_data['title'])
+        
     def test_get_game_by_id_not_found(self) -> None:
         """Test retrieval of a non-existent game by ID"""
         # Act
-        response = self.client.get(f'{self.GAMES_API_PATH}/999')
-        data = self._get_response_data(response)
+        response = self.client.get(self.GAME_ITEM_PATH % 999)
+        data = response.get_json()
         
         # Assert
         self.assertEqual(response.status_code, 404)
@@ -178,21 +326,15 @@ class TestGamesRoutes(unittest.TestCase):
     def test_create_game_success(self) -> None:
         """Test successful creation of a new game"""
         # Arrange
-        new_game_data = {
-            "title": "New Test Game",
-            "description": "This is a test game for creation testing",
-            "publisher_id": 1,
-            "category_id": 1,
-            "star_rating": 4.8
-        }
+        new_game_data = self.PAYLOADS["new_game"]
         
         # Act
         response = self.client.post(
             self.GAMES_API_PATH,
-            json=new_game_data,
+            data=self.PAYLOAD_BYTES["new_game"],
             content_type='application/json'
         )
-        data = self._get_response_data(response)
+        data = response.get_json()
         
         # Assert
         self.assertEqual(response.status_code, 201)
@@ -204,19 +346,13 @@ class TestGamesRoutes(unittest.TestCase):
 
     def test_create_game_missing_fields(self) -> None:
         """Test game creation with missing required fields"""
-        # Arrange
-        incomplete_data = {
-            "title": "Incomplete Game"
-            # Missing description, publisher_id, category_id
-        }
-        
         # Act
         response = self.client.post(
             self.GAMES_API_PATH,
-            json=incomplete_data,
+            data=self.PAYLOAD_BYTES["incomplete_game"],
             content_type='application/json'
         )
-        data = self._get_response_data(response)
+        data = response.get_json()
         
         # Assert
         self.assertEqual(response.status_code, 400)
@@ -225,21 +361,13 @@ class TestGamesRoutes(unittest.TestCase):
 
     def test_create_game_invalid_publisher(self) -> None:
         """Test game creation with non-existent publisher"""
-        # Arrange
-        invalid_data = {
-            "title": "Test Game",
-            "description": "This is a test game with invalid publisher",
-            "publisher_id": 999,  # Non-existent publisher
-            "category_id": 1
-        }
-        
         # Act
         response = self.client.post(
             self.GAMES_API_PATH,
-            json=invalid_data,
+            data=self.PAYLOAD_BYTES["invalid_publisher_game"],
             content_type='application/json'
         )
-        data = self._get_response_data(response)
+        data = response.get_json()
         
         # Assert
         self.assertEqual(response.status_code, 404)
@@ -247,21 +375,13 @@ class TestGamesRoutes(unittest.TestCase):
 
     def test_create_game_invalid_category(self) -> None:
         """Test game creation with non-existent category"""
-        # Arrange
-        invalid_data = {
-            "title": "Test Game",
-            "description": "This is a test game with invalid category",
-            "publisher_id": 1,
-            "category_id": 999  # Non-existent category
-        }
-        
         # Act
         response = self.client.post(
             self.GAMES_API_PATH,
-            json=invalid_data,
+            data=self.PAYLOAD_BYTES["invalid_category_game"],
             content_type='application/json'
         )
-        data = self._get_response_data(response)
+        data = response.get_json()
         
         # Assert
         self.assertEqual(response.status_code, 404)
@@ -271,7 +391,7 @@ class TestGamesRoutes(unittest.TestCase):
         """Test game creation with no JSON data"""
         # Act
         response = self.client.post(self.GAMES_API_PATH)
-        data = self._get_response_data(response)
+        data = response.get_json()
         
         # Assert
         self.assertEqual(response.status_code, 400)
@@ -279,136 +399,110 @@ class TestGamesRoutes(unittest.TestCase):
 
     def test_update_game_success(self) -> None:
         """Test successful update of an existing game"""
-        # Get the first game's ID
-        response = self.client.get(self.GAMES_API_PATH)
-        games = self._get_response_data(response)
-        game_id = games[0]['id']
+        # Use the first seeded game's ID
+        game_id = self.seeded_game_ids[0]
         
         # Arrange update data
-        update_data = {
-            "title": "Updated Test Game",
-            "star_rating": 5.0
-        }
+        update_data = self.PAYLOADS["updated_title_and_rating"]
         
         # Act
         response = self.client.put(
-            f'{self.GAMES_API_PATH}/{game_id}',
-            json=update_data,
+            self.GAME_ITEM_PATH % game_id,
+            data=self.PAYLOAD_BYTES["updated_title_and_rating"],
             content_type='application/json'
         )
-        data = self._get_response_data(response)
+        data = response.get_json()
         
         # Assert
         self.assertEqual(response.status_code, 200)
         self.assertEqual(data['title'], update_data['title'])
         self.assertEqual(data['starRating'], update_data['star_rating'])
 
-    def test_update_game_not_found(self) -> None:
-        """Test update of a non-existent game"""
-        # Arrange
-        update_data = {
-            "title": "Updated Game"
-        }
-        
-        # Act
-        response = self.client.put(
-            f'{self.GAMES_API_PATH}/999',
-            json=update_data,
-            content_type='application/json'
-        )
-        data = self._get_response_data(response)
-        
-        # Assert
-        self.assertEqual(response.status_code, 404)
-        self.assertEqual(data['error'], "Game not found")
+    def test_update_game_publisher_and_category(self) -> None:
+        """Test that updating references returns the new publisher and category"""
+        # Use the first seeded game's ID
+        game_id = self.seeded_game_ids[0]
 
-    def test_update_game_invalid_publisher(self) -> None:
-        """Test game update with non-existent publisher"""
-        # Get the first game's ID
-        response = self.client.get(self.GAMES_API_PATH)
-        games = self._get_response_data(response)
-        game_id = games[0]['id']
-        
-        # Arrange invalid update data
-        update_data = {
-            "publisher_id": 999  # Non-existent publisher
-        }
-        
-        # Act
+        # Act - point the game at the second publisher and category
         response = self.client.put(
-            f'{self.GAMES_API_PATH}/{game_id}',
-            json=update_data,
+            self.GAME_ITEM_PATH % game_id,
+            data=self.PAYLOAD_BYTES["updated_references"],
             content_type='application/json'
         )
-        data = self._get_response_data(response)
-        
+        data = response.get_json()
+
         # Assert
-        self.assertEqual(response.status_code, 404)
-        self.assertEqual(data['error'], "Publisher not found")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data['publisher']['id'], 2)
+        self.assertEqual(data['publisher']['name'], self.TEST_DATA["publishers"][1]["name"])
+        self.assertEqual(data['category']['id'], 2)
+        self.assertEqual(data['category']['name'], self.TEST_DATA["categories"][1]["name"])
 
-    def test_update_game_invalid_category(self) -> None:
-        """Test game update with non-existent category"""
-        # Get the first game's ID
-        response = self.client.get(self.GAMES_API_PATH)
-        games = self._get_response_data(response)
-        game_id = games[0]['id']
-        
-        # Arrange invalid update data
-        update_data = {
-            "category_id": 999  # Non-existent category
-        }
-        
+    def test_update_game_not_found(self) -> None:
+        """Test update of a non-existent game"""
         # Act
         response = self.client.put(
-            f'{self.GAMES_API_PATH}/{game_id}',
-            json=update_data,
+            self.GAME_ITEM_PATH % 999,
+            data=self.PAYLOAD_BYTES["updated_title"],
             content_type='application/json'
         )
-        data = self._get_response_data(response)
+        data = response.get_json()
         
         # Assert
         self.assertEqual(response.status_code, 404)
-        self.assertEqual(data['error'], "Category not found")
+        self.assertEqual(data['error'], "Game not found")
 
-    def test_update_game_no_json_data(self) -> None:
-        """Test game update with no JSON data"""
-        # Get the first game's ID
-        response = self.client.get(self.GAMES_API_PATH)
-        games = self._get_response_data(response)
-        game_id = games[0]['id']
-        
-        # Act
-        response = self.client.put(f'{self.GAMES_API_PATH}/{game_id}')
-        data = self._get_response_data(response)
+    def test_update_game_error_matrix(self) -> None:
+        """Test game update failures for bad references and missing JSON data"""
+        # Use the first seeded game's ID
+        game_id = self.seeded_game_ids[0]
+        
+        # (payload name or None for no body, expected status, expected error)
+        cases = (
+            ("invalid_publisher_update", 404, "Publisher not found"),
+            ("invalid_category_update", 404, "Category not found"),
+            (None, 400, "No JSON data provided")
+        )
         
-        # Assert
-        self.assertEqual(response.status_code, 400)
-        self.assertEqual(data['error'], "No JSON data provided")
+        for payload_name, expected_status, expected_error in cases:
+            with self.subTest(expected_error):
+                # Act
+                if payload_name is None:
+                    response = self.client.put(self.GAME_ITEM_PATH % game_id)
+                else:
+                    response = self.client.put(
+                        self.GAME_ITEM_PATH % game_id,
+                        data=self.PAYLOAD_BYTES[payload_name],
+                        content_type='application/json'
+                    )
+                data = response.get_json()
+                
+                # Assert
+                self.assertEqual(response.status_code, expected_status)
+                self.assertEqual(data['error'], expected_error)
 
     def test_delete_game_success(self) -> None:
         """Test successful deletion of a game"""
-        # Get the first game's ID
-        response = self.client.get(self.GAMES_API_PATH)
-        games = self._get_response_data(response)
-        game_id = games[0]['id']
+        # Use the first seeded game's ID
+        game_id = self.seeded_game_ids[0]
         
         # Act
-        response = self.client.delete(f'{self.GAMES_API_PATH}/{game_id}')
-        data = self._get_response_data(response)
+        response = self.client.delete(self.GAME_ITEM_PATH % game_id)
+        data = response.get_json()
         
         # Assert
         self.assertEqual(response.status_code, 200)
         self.assertEqual(data['message'], "Game deleted successfully")
         
         # Verify game is actually deleted
-        get_response = self.client.get(f'{self.GAMES_API_PATH}/{game_id}')
+        get_response = self.client.get(self.GAME_ITEM_PATH % game_id)
         self.assertEqual(get_response.status_code, 404)
 
     def test_delete_game_not_found(self) -> None:
         """Test deletion of a non-existent game"""
         # Act
-        response = self.client.delete(f'{self.GAMES_API_PATH}/999')
-        data = self._get_response_data(response)
+        response = self.client.delete(self.GAME_ITEM_PATH % 999)
+        data = response.get_json()
         
         # Assert
         self.assertEqual(response.status_code, 404)